@@ -2,15 +2,66 @@ import tkinter as tk
 from tkinter import messagebox, filedialog, ttk
 import tkinter.font as tkfont
 import os
+import bisect
+import codecs
+import csv
+import re
 
 # Always use UTF-16 LE for CODESYS compatibility
 DEFAULT_ENCODING = "utf-16-le"
+BOM_UTF16_LE = codecs.BOM_UTF16_LE  # b'\xff\xfe'
+# Codec functions looked up once instead of by name on every encode/decode
+_encode = codecs.getencoder(DEFAULT_ENCODING)
+_decode = codecs.getdecoder(DEFAULT_ENCODING)
 
 csv_file_path = None
 
 # Track editing state
 editing = False
 original_id = None
+# The exact cached row being edited (IDs may repeat), the tree item showing it,
+# and the cache generation both were taken from
+editing_row = None
+editing_item = None
+editing_generation = None
+
+# In-memory cache of parsed rows, valid while the file's mtime is unchanged
+_rows_cache = None
+_rows_cache_path = None
+_rows_cache_mtime = None
+# ID -> cached data row with that ID
+_id_index = {}
+# (byte offset, byte length) on disk of each cached row, parallel to _rows_cache
+_row_spans = []
+# ID sort key of each cached row, parallel to _rows_cache (None for version + header).
+# Data rows are kept sorted by this key, so the preview never has to sort.
+_row_keys = []
+# Preview values (ID, Condition, Class, Message) of each cached row, parallel to
+# _rows_cache (None for version + header). Built once when a row enters the cache
+# so the preview scans read only the displayed fields.
+_row_previews = []
+# True while deletions/edits are held in memory and not yet written to the file
+_pending_flush = False
+# Whether the cached file starts with a BOM (kept when the file is rewritten)
+_rows_cache_bom = False
+# Bumped whenever the cache is replaced with a new row list (re-read or new file)
+_cache_generation = 0
+
+# Preview tree state: the sort key of every item in tree order
+_tree_keys = []
+# Tree item -> cached row it shows (the cache, not the Treeview, is the source of truth)
+_tree_item_rows = {}
+# Cache generation the preview was last rebuilt from
+_tree_generation = None
+# True while a coalesced preview rebuild is scheduled on the Tk idle queue
+_refresh_pending = False
+
+# Newlines become spaces, double quotes become single quotes (one pass per value)
+_SANITIZE_TABLE = str.maketrans({"\n": " ", "\r": " ", '"': "'"})
+# Most values contain none of these, so checking first skips the rewrite entirely
+_FORBIDDEN_CHARS = re.compile(r'[\r\n"]')
+# Characters trimmed from both ends of every cell when reading
+_QUOTES_AND_WS = " \t\r\n\x0b\x0c\"'"
 
 # Full CSV columns (kept for header creation if file is new)
 COLUMNS = [
@@ -31,6 +82,30 @@ COLUMNS = [
     "HigherPrioAlarm"
 ]
 
+# Padding source for short rows: _EMPTY_PAD[len(row):] fills a row up to len(COLUMNS)
+_EMPTY_PAD = [""] * len(COLUMNS)
+
+SEPARATOR = ";"
+LINE_END = "\r\n"
+# Cells containing any of these are quoted so csv.reader reads them back unchanged
+_NEEDS_QUOTES = re.compile("[" + re.escape(SEPARATOR) + '"\r\n]')
+# The same set minus the separator, for checking a whole joined line at once
+_QUOTE_CHARS = re.compile('["\r\n]')
+
+# Fixed lines of a new file, pre-encoded once (BOM + version line + header line)
+VERSION_LINE = "#Version: 1.0.0.0" + SEPARATOR * (len(COLUMNS) - 1) + LINE_END
+HEADER_LINE = SEPARATOR.join(COLUMNS) + LINE_END
+_VERSION_BYTES = _encode(VERSION_LINE)[0]
+_HEADER_BYTES = _encode(HEADER_LINE)[0]
+_NEW_FILE_BYTES = BOM_UTF16_LE + _VERSION_BYTES + _HEADER_BYTES
+
+# Shown after a change that is held in memory (see flush_pending_changes)
+PENDING_NOTE = "The file is updated on Save File, when switching files or on close."
+
+# Leading rows of a file that are not alarms (version line + header line).
+# A file with fewer rows is all header: its first min(len, HEADER_ROWS) rows are skipped.
+HEADER_ROWS = 2
+
 # ---------------------------------------------------------------
 # UTIL: Manual UTF-16 LE CSV Writer (SAFE FOR CODESYS)
 # ---------------------------------------------------------------
@@ -38,40 +113,120 @@ def ensure_file_and_header(path):
     """Ensure file exists. If not, create and write header using DEFAULT_ENCODING."""
     if os.path.exists(path):
         return
-    header_line = ";".join(COLUMNS) + "\r\n"
     # Create file with header
-    with open(path, "w", encoding=DEFAULT_ENCODING) as f:
-        f.write(header_line)
+    with open(path, "wb") as f:
+        f.write(_HEADER_BYTES)
+
+
+def sanitize_value(v):
+    """Replace newlines with spaces and double quotes with single quotes."""
+    if v is None:
+        return ""
+    v = str(v)
+    if _FORBIDDEN_CHARS.search(v) is None:
+        return v
+    return v.translate(_SANITIZE_TABLE)
+
+
+def _quote_cell(v):
+    """Quote v (doubling inner quotes) if it contains the separator, a quote or a newline."""
+    if _NEEDS_QUOTES.search(v) is None:
+        return v
+    return '"' + v.replace('"', '""') + '"'
+
+
+def _join_cells(cells):
+    """Join cells into one CSV line that csv.reader splits back into the same cells."""
+    line = SEPARATOR.join(cells)
+    # Nearly every row has no separator inside a cell and nothing to escape
+    if line.count(SEPARATOR) == len(cells) - 1 and _QUOTE_CHARS.search(line) is None:
+        return line + LINE_END
+    return SEPARATOR.join([_quote_cell(c) for c in cells]) + LINE_END
+
+
+def _format_line(row_values):
+    """Return a sanitized CSV line (manual join, avoids csv.writer with UTF-16)."""
+    return _join_cells([sanitize_value(v) for v in row_values])
+
+
+def _line_nbytes(line):
+    """Size of line in bytes once encoded with DEFAULT_ENCODING."""
+    if line.isascii():
+        return 2 * len(line)
+    return len(_encode(line)[0])
 
 
 def append_row_utf16le(path, row_values):
-    """Append a sanitized row to file (manual join, avoids csv.writer with UTF-16)."""
-    safe_values = []
-    for v in row_values:
-        if v is None:
-            v = ""
-        else:
-            v = str(v)
-            # remove newlines and trim
-            v = v.replace("\n", " ").replace("\r", " ")
-            # replace double quotes with single quotes (avoid internal double quotes)
-            v = v.replace('"', "'")
-        safe_values.append(v)
+    """Append a sanitized row to file. Returns the cached row, or None if uncached."""
+    parsed = append_lines_utf16le(path, [_format_line(row_values)])
+    return parsed[0] if parsed else None
+
 
-    line = ";".join(safe_values) + "\r\n"
+def append_lines_utf16le(path, lines):
+    """Append already formatted lines with a single write.
 
+    Returns the cached rows for the lines (None for a line that landed in
+    the header of a short file), or None if the cache was not valid.
+    """
     # Ensure file exists (and header) before appending
     ensure_file_and_header(path)
 
-    with open(path, "a", encoding=DEFAULT_ENCODING) as f:
-        f.write(line)
+    cached = _cache_is_valid(path)
+
+    with open(path, "ab") as f:
+        f.seek(0, os.SEEK_END)
+        offset = f.tell()
+        f.write(_encode("".join(lines))[0])
+
+    if not cached:
+        _invalidate_cache()
+        return None
+    parsed_rows = []
+    for line in lines:
+        n = _line_nbytes(line)
+        parsed = _parse_line(line)
+        parsed_rows.append(parsed if _cache_insert(parsed, (offset, n)) else None)
+        offset += n
+    _update_cache(path, _rows_cache, _row_spans)
+    return parsed_rows
+
+
+def write_all_rows(path, rows, bom=False):
+    """Overwrite path with rows, encoded once and written with a single call.
+
+    Rows must be full length (cached rows always are), so each line is a
+    plain join with no padding or length checks. Returns the
+    (offset, length) span of every row in the new file.
+    """
+    # A C-level join is faster than a generated 15-field format/f-string;
+    # only cells that need quoting take the slow path
+    lines = [_join_cells(row) for row in rows]
+
+    spans = []
+    offset = len(BOM_UTF16_LE) if bom else 0
+    for line in lines:
+        n = _line_nbytes(line)
+        spans.append((offset, n))
+        offset += n
+
+    payload, _ = _encode("".join(lines))
+    if bom:
+        payload = BOM_UTF16_LE + payload
+    with open(path, "wb") as f:
+        f.write(payload)
+    return spans
+
+
+def overwrite_row_in_place(path, offset, line):
+    """Overwrite one row on disk; line must encode to the old row's byte length."""
+    with open(path, "r+b") as f:
+        f.seek(offset)
+        f.write(_encode(line)[0])
 
 # ---------------------------------------------------------------
 # CREATE CSV
 # ---------------------------------------------------------------
 
-BOM_UTF16_LE = b'\xff\xfe'  # UTF-16 LE BOM
-
 def create_new_file():
     global csv_file_path
     file_path = filedialog.asksaveasfilename(
@@ -82,25 +237,31 @@ def create_new_file():
     if not file_path:
         return  # User canceled
 
+    if not flush_pending_changes():
+        return
+
+    leave_edit_mode()
     csv_file_path = file_path
     try:
         with open(csv_file_path, "wb") as f:
-            # Write BOM
-            f.write(BOM_UTF16_LE)
-
-            # Version line
-            version_line = "#Version: 1.0.0.0" + ";" * (len(COLUMNS)-1) + "\r\n"
-            f.write(version_line.encode("utf-16-le"))
-
-            # Header line
-            header_line = ";".join(COLUMNS) + "\r\n"
-            f.write(header_line.encode("utf-16-le"))
+            f.write(_NEW_FILE_BYTES)
 
     except Exception as e:
+        _invalidate_cache()
         messagebox.showerror("Error", f"Failed to create file:\n{e}")
         return
 
-    label_selected_file.config(text=f"Selected: {csv_file_path}")
+    version_start = len(BOM_UTF16_LE)
+    header_start = version_start + len(_VERSION_BYTES)
+    _update_cache(
+        csv_file_path,
+        [_parse_line(VERSION_LINE), _parse_line(HEADER_LINE)],
+        [(version_start, len(_VERSION_BYTES)), (header_start, len(_HEADER_BYTES))],
+        [None, None],
+        bom=True,
+    )
+
+    update_file_label()
     refresh_preview_and_autosize()
     messagebox.showinfo("Success", "New CSV file created successfully!")
 
@@ -108,26 +269,241 @@ def create_new_file():
 # ---------------------------------------------------------------
 # READ CSV (simple parser)
 # ---------------------------------------------------------------
+def _cache_is_valid(path):
+    """True if the cached rows belong to path and the file is unchanged on disk."""
+    if _rows_cache is None or _rows_cache_path != path:
+        return False
+    if _pending_flush:
+        # Unflushed deletions/edits make the cache the source of truth
+        return True
+    try:
+        return os.path.getmtime(path) == _rows_cache_mtime
+    except OSError:
+        return False
+
+
+def _update_cache(path, rows, spans, keys=None, bom=None):
+    """Store rows (and their on-disk spans) as the cached content of path.
+
+    Call after writing the file. Pass keys when rows is a new sorted list
+    (this rebuilds the ID index and starts a new cache generation); omit it
+    when the cache was updated through _cache_insert/_cache_remove. Pass bom
+    only when it is (re)detected.
+    """
+    global _rows_cache, _rows_cache_path, _rows_cache_mtime, _row_spans, _row_keys, _row_previews
+    global _rows_cache_bom, _cache_generation
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        _invalidate_cache()
+        return
+    _rows_cache = rows
+    _row_spans = spans
+    if bom is not None:
+        _rows_cache_bom = bom
+    _rows_cache_path = path
+    _rows_cache_mtime = mtime
+    if keys is not None:
+        _cache_generation += 1
+        _row_keys = keys
+        head = min(len(rows), HEADER_ROWS)
+        _row_previews = [None] * head + [preview_values(r) for r in rows[head:]]
+        _rebuild_id_index()
+
+
+def _rebuild_id_index():
+    """Map each ID to its first data row (first two rows are version + header)."""
+    global _id_index
+    _id_index = {}
+    for i in range(HEADER_ROWS, len(_rows_cache)):
+        _id_index.setdefault(_rows_cache[i][0], _rows_cache[i])
+
+
+def _cache_insert(row, span):
+    """Insert a row at its sorted position in the cache.
+
+    Returns False when the cache is still short of HEADER_ROWS rows: the row
+    then becomes a header row, as a fresh read of the file would treat it.
+    """
+    if len(_rows_cache) < HEADER_ROWS:
+        _rows_cache.append(row)
+        _row_spans.append(span)
+        _row_keys.append(None)
+        _row_previews.append(None)
+        return False
+    key = try_int_key(row[0])
+    pos = bisect.bisect_right(_row_keys, key, HEADER_ROWS)
+    _rows_cache.insert(pos, row)
+    _row_spans.insert(pos, span)
+    _row_keys.insert(pos, key)
+    _row_previews.insert(pos, preview_values(row))
+    _id_index.setdefault(row[0], row)
+    return True
+
+
+def _cache_position(row):
+    """Position of a cached data row (matched by identity).
+
+    Raises ValueError if the row is not in the cache.
+    """
+    key = try_int_key(row[0])
+    pos = bisect.bisect_left(_row_keys, key, HEADER_ROWS)
+    while pos < len(_rows_cache) and _row_keys[pos] == key:
+        if _rows_cache[pos] is row:
+            return pos
+        pos += 1
+    raise ValueError("row is not cached")
+
+
+def _cache_remove(row):
+    """Remove a data row from the cache and return its on-disk span."""
+    pos = _cache_position(row)
+    del _rows_cache[pos]
+    span = _row_spans.pop(pos)
+    key = _row_keys.pop(pos)
+    del _row_previews[pos]
+    id_val = row[0]
+    if _id_index.get(id_val) is row:
+        del _id_index[id_val]
+        # Any other row with this ID has the same sort key, so it is adjacent
+        i = bisect.bisect_left(_row_keys, key, HEADER_ROWS)
+        while i < len(_row_keys) and _row_keys[i] == key:
+            if _rows_cache[i][0] == id_val:
+                _id_index[id_val] = _rows_cache[i]
+                break
+            i += 1
+    return span
+
+
+def _invalidate_cache():
+    global _rows_cache, _rows_cache_path, _rows_cache_mtime, _id_index, _row_spans, _row_keys, _row_previews
+    global _pending_flush, _rows_cache_bom
+    _rows_cache = None
+    _rows_cache_path = None
+    _rows_cache_mtime = None
+    _id_index = {}
+    _row_spans = []
+    _row_keys = []
+    _row_previews = []
+    _pending_flush = False
+    _rows_cache_bom = False
+
+
+def _clean_cells(cols):
+    """Sanitize tokenized cells and pad them to a full-length row."""
+    cols = [c.strip(_QUOTES_AND_WS) for c in cols]
+    cols.extend(_EMPTY_PAD[len(cols):])
+    return cols
+
+
+def _csv_reader(lines):
+    """csv.reader for the CODESYS dialect (';' separated, '"' quoted)."""
+    return csv.reader(lines, delimiter=SEPARATOR, quotechar='"')
+
+
+def _parse_line(line):
+    """Split one CSV line into a full-length list of sanitized cells."""
+    return _clean_cells(next(_csv_reader([line]), []))
+
+
 def read_all_rows(path):
-    """Return list of rows (each row is list of columns)."""
-    rows = []
+    """Return list of rows (each row is list of columns).
+
+    The parsed rows are cached and reused until the file changes on disk.
+    The returned list is the cache itself; callers must not mutate it.
+    """
+    if _cache_is_valid(path):
+        return _rows_cache
+
     try:
-        with open(path, "r", encoding=DEFAULT_ENCODING) as f:
-            lines = f.read().splitlines()
+        rows, spans, bom = parse_csv_file(path)
     except Exception:
-        return rows
+        # Don't leave another file's rows and ID index behind, but never
+        # drop deletions/edits that have not been written yet
+        if not _pending_flush:
+            _invalidate_cache()
+        return []
+
+    # Sort data rows by ID once, here, keeping each row's span alongside
+    head = min(len(rows), HEADER_ROWS)
+    keys = [None] * head + [try_int_key(r[0]) for r in rows[head:]]
+    order = list(range(head)) + sorted(range(head, len(rows)), key=keys.__getitem__)
+    rows = [rows[i] for i in order]
+    spans = [spans[i] for i in order]
+    keys = [keys[i] for i in order]
+
+    _update_cache(path, rows, spans, keys, bom=bom)
+    return rows
+
 
+def parse_csv_file(path):
+    """Parse a UTF-16 LE CODESYS CSV without touching the cache.
+
+    Returns (rows, spans, bom): full-length rows in file order, the
+    (offset, length) byte span of each, and whether the file has a BOM.
+    """
+    rows = []
+    spans = []
+    # Read raw bytes and decode in one shot (no TextIOWrapper chunking)
+    with open(path, "rb") as f:
+        data = f.read()
+    bom = data.startswith(BOM_UTF16_LE)
+    offset = len(BOM_UTF16_LE) if bom else 0
+    # keepends so byte offsets can be tracked
+    text, _ = _decode(data[offset:])
+    lines = text.splitlines(keepends=True)
+
+    # Byte offset at which each line starts (plus end of file)
+    starts = [offset]
     for line in lines:
-        if not line.strip():
-            continue
-        cols = line.split(";")
-        # sanitize each cell
-        cols = [c.strip().strip('"').strip("'") for c in cols]
-        # pad to full length
-        while len(cols) < len(COLUMNS):
-            cols.append("")
-        rows.append(cols)
-    return rows
+        offset += _line_nbytes(line)
+        starts.append(offset)
+
+    # Tokenize in C, mapping records back to lines via line_num
+    reader = _csv_reader(lines)
+    first_line = 0
+    for cols in reader:
+        last_line = reader.line_num
+        if last_line - first_line == 1:
+            records = [(cols, first_line)]
+        else:
+            # A quote left open swallowed the following lines into one field:
+            # parse each of those lines as its own row instead of merging them
+            records = [(next(_csv_reader([lines[i]]), []), i) for i in range(first_line, last_line)]
+        for cols, i in records:
+            if cols and (len(cols) > 1 or cols[0].strip()):
+                rows.append(_clean_cells(cols))
+                spans.append((starts[i], starts[i + 1] - starts[i]))
+        first_line = last_line
+
+    return rows, spans, bom
+
+
+def flush_pending_changes():
+    """Export deferred changes to the CSV in one pass. Returns False on failure.
+
+    Rows are written in their file order, not the ID order of the cache:
+    edited rows keep their old offset and appended rows sit at the end.
+    """
+    global _pending_flush
+    if not _pending_flush:
+        return True
+    rows = _rows_cache
+    offsets = [span[0] for span in _row_spans]
+    order = sorted(range(len(rows)), key=offsets.__getitem__)
+    try:
+        written = write_all_rows(_rows_cache_path, [rows[i] for i in order], _rows_cache_bom)
+    except Exception as e:
+        messagebox.showerror("Write Error", f"Failed to update CSV:\n{e}")
+        return False
+    # Map the new spans back onto the cache order
+    spans = [None] * len(rows)
+    for i, span in zip(order, written):
+        spans[i] = span
+    _pending_flush = False
+    _update_cache(_rows_cache_path, rows, spans)
+    update_file_label()
+    return True
 
 
 # ---------------------------------------------------------------
@@ -142,65 +518,160 @@ def build_condition(details1, details2, details3):
 
 
 def try_int_key(x):
-    """Return tuple for sorting: numeric if possible, else lexicographic."""
-    try:
-        return (0, int(x))
-    except Exception:
-        return (1, str(x))
+    """Return tuple for sorting: numeric if possible, else lexicographic.
+
+    Checks the digits up front instead of try/except around int(), so
+    non-numeric IDs never pay for a raised exception.
+    """
+    s = str(x) if x is not None else ""
+    if s.isdecimal() or (s[:1] == "-" and s[1:].isdecimal()):
+        return (0, int(s))
+    return (1, s)
+
+
+def preview_values(r):
+    """Tree values (ID, Condition, Class, Message) for a full-length row."""
+    return (r[0], build_condition(r[2], r[3], r[4]), r[9], r[10])
+
+
+def preview_in_sync():
+    """True if the tree mirrors the current cache and can be patched in place."""
+    return (
+        not _refresh_pending
+        and csv_file_path is not None
+        and _cache_is_valid(csv_file_path)
+        and _tree_generation == _cache_generation
+    )
+
+
+def preview_insert(row):
+    """Insert one row into the tree at its sorted position."""
+    key = try_int_key(row[0])
+    pos = bisect.bisect_right(_tree_keys, key)
+    _tree_keys.insert(pos, key)
+    values = preview_values(row)
+    item = tree.insert("", pos, values=values)
+    _tree_item_rows[item] = row
+    grow_columns(values)
+    return item
+
+
+def preview_remove(item):
+    """Remove one item from the tree."""
+    del _tree_keys[tree.index(item)]
+    tree.delete(item)
+    _tree_item_rows.pop(item, None)
+
+
+def preview_row(item):
+    """Cached row shown by item, or None if the preview is out of date."""
+    if not preview_in_sync():
+        return None
+    return _tree_item_rows.get(item)
+
+
+def preview_update(item, row):
+    """Show row in item, moving it if its ID changed.
+
+    Returns False if the item is unknown (caller should rebuild instead).
+    """
+    old_row = _tree_item_rows.get(item)
+    if old_row is None:
+        return False
+    old_id = old_row[0]
+    values = preview_values(row)
+    tree.item(item, values=values)
+    _tree_item_rows[item] = row
+    new_id = row[0]
+    if new_id != old_id:
+        del _tree_keys[tree.index(item)]
+        key = try_int_key(new_id)
+        pos = bisect.bisect_right(_tree_keys, key)
+        _tree_keys.insert(pos, key)
+        tree.move(item, "", pos)
+    grow_columns(values)
+    return True
 
 
 def refresh_preview_and_autosize():
+    """Schedule a full preview rebuild; calls within one event loop pass coalesce."""
+    global _refresh_pending
+    if _refresh_pending:
+        return
+    _refresh_pending = True
+    root.after_idle(_flush_refresh)
+
+
+def _flush_refresh():
+    global _refresh_pending
+    _refresh_pending = False
+    _do_refresh()
+
+
+def _do_refresh():
+    global _tree_keys, _tree_item_rows, _tree_generation
     # Clear tree
     for row in tree.get_children():
         tree.delete(row)
+    _tree_keys = []
+    _tree_item_rows = {}
+    _tree_generation = None
+    # Drop widths of texts that are no longer shown (e.g. from a previous file)
+    _measure_cache.clear()
 
     if not csv_file_path:
         return
 
     rows = read_all_rows(csv_file_path)
-    # Skip first two rows (version + header)
-    if len(rows) > 2:
-        data_rows = rows[2:]
-    else:
-        data_rows = []
-
-    # Sort by ID (try numeric)
-    data_rows_sorted = sorted(data_rows, key=lambda r: try_int_key(r[0] if r and len(r) > 0 else ""))
-
-    # Populate tree with ID, Condition, Class, Message
-    for r in data_rows_sorted:
-        id_val = r[0]
-        details1 = r[2] if len(r) > 2 else ""
-        details2 = r[3] if len(r) > 3 else "="
-        details3 = r[4] if len(r) > 4 else ""
-        class_val = r[9] if len(r) > 9 else ""
-        message = r[10] if len(r) > 10 else ""
-        condition = build_condition(details1, details2, details3)
-        tree.insert("", "end", values=(id_val, condition, class_val, message))
+    # Skip first two rows (version + header); the cache is already sorted by ID
+    data_rows = rows[HEADER_ROWS:]
 
+    # Populate tree with the prebuilt ID, Condition, Class, Message values
+    for r, values in zip(data_rows, _row_previews[HEADER_ROWS:]):
+        item = tree.insert("", "end", values=values)
+        _tree_item_rows[item] = r
+    _tree_keys = _row_keys[HEADER_ROWS:]
+
+    _tree_generation = _cache_generation
     autosize_columns()
 
 
+# Text -> pixel width; cleared on every full preview rebuild so it stays bounded
+_measure_cache = {}
+
+
+def measure_text(text):
+    """Pixel width of text in the app font (memoized, alarm texts repeat a lot)."""
+    w = _measure_cache.get(text)
+    if w is None:
+        w = _measure_cache[text] = app_font.measure(text)
+    return w
+
+
 def autosize_columns():
-    # Use the app font defined for your app
-    font = app_font
-
-    # Iterate over all columns
-    for col in columns_display:
-        # Start with the header width
-        max_width = font.measure(col)
-
-        # Measure all values in this column
-        for item in tree.get_children():
-            val = str(tree.item(item, "values")[columns_display.index(col)])
-            w = font.measure(val)
-            if w > max_width:
-                max_width = w
-
-        # Set the column width with some padding
+    # Start with the header widths
+    max_widths = [measure_text(col) for col in columns_display]
+
+    # Single pass over the cached preview values the tree was built from
+    # (no Tcl round-trips, no full rows touched)
+    for values in _row_previews[HEADER_ROWS:]:
+        for i, v in enumerate(values):
+            w = measure_text(str(v))
+            if w > max_widths[i]:
+                max_widths[i] = w
+
+    # Set the column widths with some padding
+    for col, max_width in zip(columns_display, max_widths):
         tree.column(col, width=max_width + 20)
 
 
+def grow_columns(values):
+    """Widen columns that are too narrow for values (never shrinks them)."""
+    for col, val in zip(columns_display, values):
+        w = measure_text(str(val)) + 20
+        if w > tree.column(col, "width"):
+            tree.column(col, width=w)
+
 
 # ---------------------------------------------------------------
 # ID DUPLICATE CHECK
@@ -209,92 +680,86 @@ def id_exists(target_id, exclude_id=None):
     """Check if ID exists in CSV, optionally excluding one ID (useful when editing)."""
     if not csv_file_path:
         return False
-    rows = read_all_rows(csv_file_path)
-    # skip first two rows
-    if len(rows) > 2:
-        data_rows = rows[2:]
-    else:
-        data_rows = []
-    for r in data_rows:
-        if len(r) > 0:
-            if r[0] == target_id:
-                if exclude_id is not None and r[0] == exclude_id:
-                    continue
-                return True
-    return False
+    # Make sure the cache (and its ID index) reflects the current file
+    read_all_rows(csv_file_path)
+    return target_id in _id_index and target_id != exclude_id
 
 
 # ---------------------------------------------------------------
 # DELETE SELECTED ROW
 # ---------------------------------------------------------------
 def delete_selected():
-    global editing, original_id
+    global _pending_flush
     selected = tree.selection()
     if not selected:
         messagebox.showinfo("No selection", "Please select a row to delete.")
         return
 
     item = selected[0]
-    vals = tree.item(item, "values")
-    target_id = vals[0]
+    row = preview_row(item)
+    generation = _cache_generation
+    target_id = row[0] if row is not None else tree.item(item, "values")[0]
 
     if not messagebox.askyesno("Confirm delete", f"Delete entry ID '{target_id}'?"):
         return
 
-    # Read all rows and remove the first matching ID (skip first two rows)
-    rows = read_all_rows(csv_file_path)
-    new_lines = []
-    removed = False
-
-    if len(rows) > 2:
-        new_lines.extend(rows[:2])  # keep first two rows
-        data_rows = rows[2:]
-    else:
-        data_rows = rows
+    # Fall back to looking the ID up if the cache was re-read meanwhile
+    # (first two rows are never indexed)
+    read_all_rows(csv_file_path)
+    if row is None or generation != _cache_generation:
+        row = _id_index.get(target_id)
 
-    for r in data_rows:
-        if not removed and len(r) > 0 and r[0] == target_id:
-            removed = True
-            continue
-        new_lines.append(r)
-
-    if not removed:
+    if row is None:
         messagebox.showerror("Not found", "Selected ID not found in file.")
         return
 
-    # Write back all lines (overwrite) using UTF-16 LE
-    try:
-        with open(csv_file_path, "w", encoding=DEFAULT_ENCODING) as f:
-            for row in new_lines:
-                while len(row) < len(COLUMNS):
-                    row.append("")
-                line = ";".join(row) + "\r\n"
-                f.write(line)
-    except Exception as e:
-        messagebox.showerror("Write Error", f"Failed to update CSV:\n{e}")
-        return
+    # Drop the row from memory only; the file is rewritten once on save/close
+    _cache_remove(row)
+    _pending_flush = True
+    update_file_label()
 
-    if editing and original_id == target_id:
-        editing = False
-        original_id = None
-        btn_add.config(state=tk.NORMAL)
-        btn_save.config(state=tk.DISABLED)
-        entry_id.config(state=tk.NORMAL)
+    # Leave edit mode if this was the row being edited
+    if editing and (editing_row is row or (editing_generation != _cache_generation and original_id == target_id)):
+        leave_edit_mode()
 
-    refresh_preview_and_autosize()
-    messagebox.showinfo("Deleted", f"Entry ID '{target_id}' removed.")
+    if preview_in_sync():
+        preview_remove(item)
+    else:
+        refresh_preview_and_autosize()
+    messagebox.showinfo("Deleted", f"Entry ID '{target_id}' removed. {PENDING_NOTE}")
 
 
 # ---------------------------------------------------------------
 # FILE BROWSER & ADD / EDIT ENTRY
 # ---------------------------------------------------------------
+def update_file_label():
+    text = f"Selected: {csv_file_path}"
+    if _pending_flush:
+        text += "  (unsaved changes)"
+    label_selected_file.config(text=text)
+
+
+def save_file():
+    if not csv_file_path:
+        messagebox.showerror("Error", "Please select a CSV file first.")
+        return
+    if not _pending_flush:
+        messagebox.showinfo("Saved", "No unsaved changes.")
+        return
+    if flush_pending_changes():
+        messagebox.showinfo("Saved", "CSV file written successfully!")
+
+
 def browse_file():
     global csv_file_path
     file_path = filedialog.askopenfilename(title="Select CSV File", filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")])
     if file_path:
+        if not flush_pending_changes():
+            return
+        leave_edit_mode()
         csv_file_path = file_path
-        label_selected_file.config(text=f"Selected: {file_path}")
         ensure_file_and_header(csv_file_path)
+        update_file_label()
         refresh_preview_and_autosize()
         messagebox.showinfo("File Loaded", "CSV file loaded successfully!")
 
@@ -340,7 +805,7 @@ def add_entry():
     ]
 
     try:
-        append_row_utf16le(csv_file_path, row)
+        cached_row = append_row_utf16le(csv_file_path, row)
     except Exception as e:
         messagebox.showerror("Write Error", f"Failed to write to CSV:\n{e}")
         return
@@ -353,32 +818,72 @@ def add_entry():
     combo_obs_type.set("Digital")
     text_message.delete("1.0", tk.END)
 
-    refresh_preview_and_autosize()
+    if cached_row is not None and preview_in_sync():
+        preview_insert(cached_row)
+    else:
+        refresh_preview_and_autosize()
     messagebox.showinfo("Success", "Entry added successfully!")
 
 
+def add_entries(rows):
+    """Add many rows at once: one duplicate check pass, one write, one refresh.
+
+    Rows whose ID is empty, already in the file, or repeated within rows are
+    skipped. Returns (added, skipped). Raises ValueError if no file is selected.
+    """
+    if not csv_file_path:
+        raise ValueError("No CSV file selected.")
+    read_all_rows(csv_file_path)
+    existing = set(_id_index)
+    lines = []
+    for values in rows:
+        line = _format_line(values)
+        id_val = _parse_line(line)[0]
+        if not id_val or id_val in existing:
+            continue
+        existing.add(id_val)
+        lines.append(line)
+
+    if lines:
+        append_lines_utf16le(csv_file_path, lines)
+        refresh_preview_and_autosize()
+    return len(lines), len(rows) - len(lines)
+
+
+def import_csv():
+    if not csv_file_path:
+        messagebox.showerror("Error", "Please select a CSV file first.")
+        return
+    file_path = filedialog.askopenfilename(title="Import CSV File", filetypes=[("CSV Files", "*.csv"), ("All Files", "*.*")])
+    if not file_path:
+        return
+
+    try:
+        rows, _spans, _bom = parse_csv_file(file_path)
+        # Skip first two rows (version + header)
+        added, skipped = add_entries(rows[HEADER_ROWS:])
+    except Exception as e:
+        messagebox.showerror("Import Error", f"Failed to import CSV:\n{e}")
+        return
+
+    messagebox.showinfo("Imported", f"{added} entries imported, {skipped} skipped (empty or duplicate ID).")
+
+
 # ---------------------------------------------------------------
 # EDIT SELECTED / SAVE CHANGES
 # ---------------------------------------------------------------
 def edit_selected():
-    global editing, original_id
+    global editing, original_id, editing_row, editing_item, editing_generation
     selected = tree.selection()
     if not selected:
         messagebox.showinfo("No selection", "Please select a row to edit.")
         return
 
     item = selected[0]
-    vals = tree.item(item, "values")
-    target_id = vals[0]
-
-    rows = read_all_rows(csv_file_path)
-    data_rows = rows[2:] if len(rows) > 2 else rows
-
-    found = None
-    for r in data_rows:
-        if len(r) > 0 and r[0] == target_id:
-            found = r
-            break
+    read_all_rows(csv_file_path)
+    found = preview_row(item)
+    if found is None:
+        found = _id_index.get(tree.item(item, "values")[0])
 
     if not found:
         messagebox.showerror("Not found", "Selected ID not found in file.")
@@ -386,25 +891,41 @@ def edit_selected():
 
     # Populate form with values
     entry_id.delete(0, tk.END)
-    entry_id.insert(0, found[0])
+    # Entries reject forbidden characters, so sanitize before inserting
+    entry_id.insert(0, sanitize_value(found[0]))
     entry_details1.delete(0, tk.END)
-    entry_details1.insert(0, found[2] if len(found) > 2 else "")
-    combo_obs_type.set(found[1] if len(found) > 1 else "Digital")
-    combo_details3.set(found[4] if len(found) > 4 else "TRUE")
-    combo_class.set(found[9] if len(found) > 9 else "Error")
+    entry_details1.insert(0, sanitize_value(found[2]))
+    combo_obs_type.set(found[1])
+    combo_details3.set(found[4])
+    combo_class.set(found[9])
     text_message.delete("1.0", tk.END)
-    text_message.insert("1.0", found[10] if len(found) > 10 else "")
+    text_message.insert("1.0", found[10])
 
     # Enter edit mode
     editing = True
     original_id = found[0]
+    editing_row = found
+    editing_item = item
+    editing_generation = _cache_generation
     btn_add.config(state=tk.DISABLED)
     btn_save.config(state=tk.NORMAL)
     entry_id.config(state=tk.NORMAL)
 
 
+def leave_edit_mode():
+    """Forget the row being edited and switch the buttons back to adding."""
+    global editing, original_id, editing_row, editing_item
+    editing = False
+    original_id = None
+    editing_row = None
+    editing_item = None
+    btn_add.config(state=tk.NORMAL)
+    btn_save.config(state=tk.DISABLED)
+    entry_id.config(state=tk.NORMAL)
+
+
 def save_changes():
-    global editing, original_id
+    global _pending_flush
     if not editing:
         return
 
@@ -424,56 +945,62 @@ def save_changes():
         messagebox.showerror("Duplicate ID", f"ID '{new_id}' already exists!")
         return
 
-    rows = read_all_rows(csv_file_path)
-    header_rows = rows[:2] if len(rows) > 2 else []
-    data_rows = rows[2:] if len(rows) > 2 else rows
-
-    updated = False
-    new_all = header_rows.copy()
-
-    for r in data_rows:
-        if not updated and len(r) > 0 and r[0] == original_id:
-            new_r = [
-                new_id,
-                observation_type,
-                details1,
-                details2,
-                details3,
-                "",
-                "",
-                "",
-                "",
-                class_value,
-                message,
-                "",
-                "",
-                "",
-                ""
-            ]
-            new_all.append(new_r)
-            updated = True
-        else:
-            new_all.append(r)
-
-    if not updated:
+    read_all_rows(csv_file_path)
+    old_row = editing_row
+    if editing_generation != _cache_generation:
+        # The cache was re-read from disk, so the edited row object is gone
+        old_row = _id_index.get(original_id)
+    pos = None
+    # The cache is gone if the file could not be read
+    if old_row is not None and _rows_cache is not None:
+        try:
+            pos = _cache_position(old_row)
+        except ValueError:
+            pass
+
+    if pos is None:
         messagebox.showerror("Not found", "Original ID not found in file; cannot save changes.")
         return
 
-    try:
-        with open(csv_file_path, "w", encoding=DEFAULT_ENCODING) as f:
-            for row in new_all:
-                while len(row) < len(COLUMNS):
-                    row.append("")
-                line = ";".join(row) + "\r\n"
-                f.write(line)
-    except Exception as e:
-        messagebox.showerror("Write Error", f"Failed to update CSV:\n{e}")
-        return
+    line = _format_line([
+        new_id,
+        observation_type,
+        details1,
+        details2,
+        details3,
+        "",
+        "",
+        "",
+        "",
+        class_value,
+        message,
+        "",
+        "",
+        "",
+        ""
+    ])
+    item = editing_item if preview_row(editing_item) is old_row else None
+    offset, old_len = _row_spans[pos]
+    written = False
+    if _line_nbytes(line) == old_len:
+        # Same encoded size: patch just this row on disk
+        try:
+            overwrite_row_in_place(csv_file_path, offset, line)
+            written = True
+        except Exception as e:
+            # Keep the edit (and any earlier unsaved changes) in memory instead
+            _pending_flush = True
+            messagebox.showwarning("Write Error", f"Failed to update CSV, the change will be written on save:\n{e}")
+    else:
+        # Keep the change in memory; the file is rewritten once on save/close
+        _pending_flush = True
 
-    editing = False
-    original_id = None
-    btn_add.config(state=tk.NORMAL)
-    btn_save.config(state=tk.DISABLED)
+    # Re-insert under the (possibly new) ID; the row still lives at the same span on disk
+    new_row = _parse_line(line)
+    _cache_insert(new_row, _cache_remove(old_row))
+    _update_cache(csv_file_path, _rows_cache, _row_spans)
+    update_file_label()
+    leave_edit_mode()
 
     # clear form
     entry_id.delete(0, tk.END)
@@ -483,8 +1010,12 @@ def save_changes():
     combo_obs_type.set("Digital")
     text_message.delete("1.0", tk.END)
 
-    refresh_preview_and_autosize()
-    messagebox.showinfo("Saved", "Changes saved successfully!")
+    if item is None or not (preview_in_sync() and preview_update(item, new_row)):
+        refresh_preview_and_autosize()
+    if written:
+        messagebox.showinfo("Saved", "Changes saved successfully!")
+    else:
+        messagebox.showinfo("Changes pending", f"Changes kept. {PENDING_NOTE}")
 
 
 # ---------------------------------------------------------------
@@ -513,6 +1044,10 @@ btn_browse = tk.Button(top_frame, text="Browse...", width=18, command=browse_fil
 btn_browse.pack(side=tk.LEFT, padx=8)
 btn_create = tk.Button(top_frame, text="Create New File...", width=18, command=create_new_file)
 btn_create.pack(side=tk.LEFT, padx=8)
+btn_save_file = tk.Button(top_frame, text="Save File", width=18, command=save_file)
+btn_save_file.pack(side=tk.LEFT, padx=8)
+btn_import = tk.Button(top_frame, text="Import CSV...", width=18, command=import_csv)
+btn_import.pack(side=tk.LEFT, padx=8)
 label_selected_file = tk.Label(top_frame, text="No file selected", fg="gray")
 label_selected_file.pack(side=tk.LEFT, padx=8)
 
@@ -526,14 +1061,21 @@ form_frame.pack(side=tk.LEFT, fill=tk.Y, padx=(0, 20))
 preview_frame = tk.Frame(main_frame)
 preview_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
 
+def no_forbidden_chars(proposed):
+    """Entry validatecommand: refuse newlines and double quotes as they are typed."""
+    return _FORBIDDEN_CHARS.search(proposed) is None
+
+
+vcmd_no_forbidden = (root.register(no_forbidden_chars), "%P")
+
 # Form fields
 lbl = lambda t: tk.Label(form_frame, text=t)
 lbl("ID:").pack(anchor="w")
-entry_id = tk.Entry(form_frame, width=30)
+entry_id = tk.Entry(form_frame, width=30, validate="key", validatecommand=vcmd_no_forbidden)
 entry_id.pack(anchor="w", pady=3)
 
 lbl("Details1:").pack(anchor="w")
-entry_details1 = tk.Entry(form_frame, width=30)
+entry_details1 = tk.Entry(form_frame, width=30, validate="key", validatecommand=vcmd_no_forbidden)
 entry_details1.pack(anchor="w", pady=3)
 
 lbl("ObservationType:").pack(anchor="w")
@@ -582,6 +1124,15 @@ vsb.pack(side=tk.RIGHT, fill=tk.Y)
 
 tree.pack(fill=tk.BOTH, expand=True)
 
+def on_close():
+    if not flush_pending_changes():
+        if not messagebox.askyesno("Unsaved changes", "Changes could not be written to the file.\nClose anyway?"):
+            return
+    root.destroy()
+
+
+root.protocol("WM_DELETE_WINDOW", on_close)
+
 refresh_preview_and_autosize()
 
 root.mainloop()